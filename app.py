@@ -1,48 +1,169 @@
 # app.py (Final Corrected Gemini API Call)
 import streamlit as st
-import requests
-import google.generativeai as genai
-import json
-from deep_translator import GoogleTranslator
+import copy
+import random
+import re
+import threading
+import time
+from collections import deque
+
+try:
+    from orjson import loads as json_loads
+except ImportError:
+    from json import loads as json_loads
+
+# requests, deep-translator and google-generativeai are imported inside the helpers that use
+# them, so the first page load does not wait for them (google-generativeai alone takes ~0.4 s).
 
 # --- HELPER FUNCTIONS ---
 
+class _RateLimiter:
+    """Sliding-window limiter: blocks until fewer than max_calls were made in the last period seconds."""
+    def __init__(self, max_calls, period):
+        self.period = period
+        self.calls = deque(maxlen=max_calls)
+        self.lock = threading.Lock()
+
+    def wait(self):
+        with self.lock:
+            if len(self.calls) == self.calls.maxlen:
+                delay = self.period - (time.monotonic() - self.calls[0])
+                if delay > 0: time.sleep(delay)
+            self.calls.append(time.monotonic())
+
+# The Google endpoint behind deep-translator throttles at roughly 20 requests/minute,
+# so every session in the server process shares one limiter that stays below it.
+@st.cache_resource(show_spinner=False)
+def _translate_rate_limiter():
+    return _RateLimiter(max_calls=15, period=60)
+
+_TRANSLATE_ATTEMPTS = 3
+
+# Identical strings (e.g. boilerplate purpose clauses) are translated once, and the results are
+# persisted to disk so they survive restarts. The function raises on failure, so only successful
+# translations are cached; the public helpers do the warning.
+@st.cache_data(persist="disk", max_entries=4096, show_spinner=False)
+def _google_translate(text, source_lang, target_lang):
+    """Calls Google Translate under the shared rate limit, retrying transient failures with jittered exponential backoff."""
+    import requests
+    from deep_translator import GoogleTranslator
+    from deep_translator.exceptions import RequestError, TooManyRequests
+    transient_errors = (requests.exceptions.ConnectionError, requests.exceptions.Timeout, TooManyRequests, RequestError)
+    for attempt in range(_TRANSLATE_ATTEMPTS):
+        _translate_rate_limiter().wait()
+        try: return GoogleTranslator(source=source_lang, target=target_lang).translate(text)
+        except transient_errors:
+            if attempt == _TRANSLATE_ATTEMPTS - 1: raise
+            time.sleep(min(8, 2 ** attempt) + random.uniform(0, 1))
+
+# Fallback values fetch_brreg_data fills in for missing fields; these are already English.
+NO_PURPOSE_TEXT = "No official purpose found."
+NOT_AVAILABLE_TEXT = "Not available"
+
+def _needs_translation(text):
+    return bool(text and text.strip()) and text not in (NO_PURPOSE_TEXT, NOT_AVAILABLE_TEXT)
+
 def translate_to_english(text, source_lang='no', target_lang='en'):
-    if not text: return ""
-    try: return GoogleTranslator(source=source_lang, target=target_lang).translate(text)
+    if not _needs_translation(text): return text or ""
+    try: return _google_translate(text, source_lang, target_lang)
     except Exception as e:
         st.warning(f"Translation failed: {e}. Using original text.")
         return text
 
-def fetch_brreg_data(org_nr):
-    if not org_nr.isdigit() or len(org_nr) != 9: return "Error: Please enter a valid 9-digit organisation number."
+_BATCH_SEPARATOR = "§§§"
+_TRANSLATE_MAX_CHARS = 5000  # deep-translator rejects longer input for GoogleTranslator
+
+def translate_batch(texts, source_lang='no', target_lang='en'):
+    """Translates several strings with a single request by joining them on a separator marker."""
+    results = list(texts)
+    pending = [i for i, text in enumerate(texts) if _needs_translation(text)]
+    joined = f"\n\n{_BATCH_SEPARATOR}\n\n".join(texts[i] for i in pending)
+    parts = None
+    # Batching only pays off for two or more strings, and the joined text must fit the translator's limit.
+    if len(pending) >= 2 and len(joined) <= _TRANSLATE_MAX_CHARS:
+        try: parts = [part.strip() for part in _google_translate(joined, source_lang, target_lang).split(_BATCH_SEPARATOR)]
+        except Exception as e:
+            # _google_translate has already retried; repeating that per item would only burn more rate-limiter slots.
+            st.warning(f"Translation failed: {e}. Using original text.")
+            return results
+    # On a mangled marker or an over-long batch, translate one by one rather than lose or misalign fields.
+    if parts is None or len(parts) != len(pending): parts = [translate_to_english(texts[i], source_lang, target_lang) for i in pending]
+    for i, part in zip(pending, parts): results[i] = part
+    return results
+
+# One keep-alive session per server process (the script itself re-runs on every
+# interaction, so a plain module-level global would not survive).
+@st.cache_resource(show_spinner=False)
+def _brreg_session():
+    import requests
+    from requests.adapters import HTTPAdapter
+    from urllib3.util.retry import Retry
+    session = requests.Session()
+    retry = Retry(total=2, backoff_factor=0.3, status_forcelist=[502, 503, 504])
+    session.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=8, max_retries=retry))
+    return session
+
+# Cached per org_nr so repeat lookups skip the network. Unknown (404) and deleted (410)
+# entities are returned as None; other errors are raised, which keeps them out of the cache.
+@st.cache_data(ttl=3600, max_entries=512, show_spinner=False)
+def _get_brreg_entity(org_nr):
     url = f"https://data.brreg.no/enhetsregisteret/api/enheter/{org_nr}"
+    response = _brreg_session().get(url, timeout=10)
+    if response.status_code in (404, 410): return None
+    response.raise_for_status()
+    return json_loads(response.content)
+
+_ORG_NR_RE = re.compile(r"[0-9]{9}")
+_ORG_NR_WEIGHTS = (3, 2, 7, 6, 5, 4, 3, 2)
+
+def is_valid_org_nr_format(org_nr):
+    """Checks that the organisation number is exactly nine ASCII digits."""
+    return bool(_ORG_NR_RE.fullmatch(org_nr))
+
+def has_valid_check_digit(org_nr):
+    """Checks the MOD-11 control digit of a nine-digit Norwegian organisation number."""
+    checksum = sum(int(digit) * weight for digit, weight in zip(org_nr, _ORG_NR_WEIGHTS))
+    return (11 - checksum % 11) % 11 == int(org_nr[8])
+
+def fetch_brreg_data(org_nr):
+    if not is_valid_org_nr_format(org_nr): return "Error: Please enter a valid 9-digit organisation number."
+    if not has_valid_check_digit(org_nr): return "Error: This organisation number's check digit is invalid – please check for typos."
+    import requests
     try:
-        response = requests.get(url, timeout=10)
-        response.raise_for_status()
-        data = response.json()
+        data = _get_brreg_entity(org_nr)
+        if data is None: return "Error: Organisation number not found in the Brønnøysund Register."
         name = data.get("navn", "Name not found.")
-        description_no = " ".join(data["vedtektsfestetFormaal"]) if "vedtektsfestetFormaal" in data and data["vedtektsfestetFormaal"] else "No official purpose found."
-        description_en = translate_to_english(description_no)
-        website = data.get("hjemmeside", "Not available")
-        sector = data.get("naeringskode1", {}).get("beskrivelse", "Not available")
+        purpose = data.get("vedtektsfestetFormaal") or []
+        description_no = " ".join(part for part in purpose if part and part.strip()) or NO_PURPOSE_TEXT
+        website = data.get("hjemmeside", NOT_AVAILABLE_TEXT)
+        sector = data.get("naeringskode1", {}).get("beskrivelse", NOT_AVAILABLE_TEXT)
         employees = data.get("antallAnsatte", 0)
-        return {"name": name, "description_no": description_no, "description_en": description_en, "website": website, "sector": sector, "employees": employees}
+        return {"name": name, "description_no": description_no, "website": website, "sector": sector, "employees": employees}
     except requests.exceptions.HTTPError as e:
-        return f"Error: Organisation number not found or API error ({e.response.status_code})."
+        return f"Error: The Brønnøysund Register API returned an error ({e.response.status_code})."
     except requests.exceptions.RequestException as e:
         return f"Error: Could not connect to the API. {e}"
+    except ValueError:
+        # A 200 with a non-JSON body, e.g. a maintenance page; json_loads raises a plain ValueError.
+        return "Error: The Brønnøysund Register API returned an unreadable response. Please try again later."
+
+# Configured once per server process instead of on every analysis; the model keeps its client between calls.
+@st.cache_resource(show_spinner=False)
+def _gemini_model():
+    import google.generativeai as genai
+    # Configure the Gemini API key from Streamlit Secrets
+    genai.configure(api_key=st.secrets["GEMINI_API_KEY"])
+    # Configure the model to return JSON
+    generation_config = genai.GenerationConfig(response_mime_type="application/json")
+    # Initialize the model using the standard GenerativeModel class
+    return genai.GenerativeModel('gemini-2.5-flash', generation_config=generation_config)
 
 # --- CORRECTED: AI-powered SDG analysis using the standard Gemini pattern ---
+# Cached per description so re-running setup for the same company costs no tokens.
+# Errors are raised (and therefore not cached); the caller reports them.
+@st.cache_data(show_spinner=False, max_entries=256, ttl=86400)
 def analyze_sdgs_with_ai(description):
     """Uses Google's Gemini model via the standard GenerativeModel API to analyze a business description."""
-    try:
-        # Configure the Gemini API key from Streamlit Secrets
-        genai.configure(api_key=st.secrets["GEMINI_API_KEY"])
-    except Exception as e:
-        st.error(f"Error configuring Gemini. Is your API key in Streamlit Secrets? Details: {e}")
-        return {}
-
     prompt = f"""
     You are an expert in sustainability and the UN Sustainable Development Goals (SDGs).
     Analyze the following business description and identify the 3 to 5 most relevant SDGs.
@@ -54,213 +175,264 @@ def analyze_sdgs_with_ai(description):
     Do not include any text or explanations outside of the JSON object.
     """
     
-    # Configure the model to return JSON
-    generation_config = genai.GenerationConfig(response_mime_type="application/json")
-    
-    try:
-        # Initialize the model using the standard GenerativeModel class
-        model = genai.GenerativeModel('gemini-2.5-flash', generation_config=generation_config)
-        
-        # Generate content
-        response = model.generate_content(prompt)
-        return json.loads(response.text)
-    except Exception as e:
-        st.error(f"An error occurred with the Gemini AI analysis: {e}")
-        return {}
+    # Generate content
+    response = _gemini_model().generate_content(prompt)
+    return json_loads(response.text)
 
 # --- STATE MANAGEMENT INITIALIZATION ---
+SESSION_DEFAULTS = {
+    "setup_complete": False,
+    "org_nr": "",
+    "startup_name": "",
+    "business_description": "",
+    "website": "",
+    "sector": "",
+    "employees": 0,
+    "mapped_sdgs": {},
+    "prioritized_sdgs": [],
+    "goals_and_kpis": {},
+    "integration_plan": {},
+    "reporting_framework": "Not Selected",
+}
+
 if 'setup_complete' not in st.session_state:
-    st.session_state.setup_complete = False
-    st.session_state.org_nr = ""
-    st.session_state.startup_name = ""
-    st.session_state.business_description = ""
-    st.session_state.website = ""
-    st.session_state.sector = ""
-    st.session_state.employees = 0
-    st.session_state.mapped_sdgs = {}
-    st.session_state.prioritized_sdgs = []
-    st.session_state.goals_and_kpis = {}
-    st.session_state.integration_plan = {}
-    st.session_state.reporting_framework = "Not Selected"
+    # Deep copy so sessions never share the mutable dict/list defaults.
+    st.session_state.update(copy.deepcopy(SESSION_DEFAULTS))
 
 # --- APP LAYOUT AND PAGES ---
 st.set_page_config(page_title="SDG Startup Tool", layout="wide")
-st.sidebar.title("🚀 SDG Tool Navigation")
 
 # ==============================================================================
 # PAGE 1: SETUP PAGE
 # ==============================================================================
-if not st.session_state.setup_complete:
+def setup_page():
     st.title("Welcome to the AI-Powered SDG Startup Tool")
     st.write("Enter your company's Norwegian Organisation Number to begin.")
 
     def start_analysis():
         if st.session_state.org_nr:
-            with st.spinner("Fetching and translating company data..."):
-                fetched_data = fetch_brreg_data(st.session_state.org_nr)
-            
+            # One status box whose label follows the steps. It sits in a placeholder so it can be
+            # cleared on success (a toast confirms instead) and only stays on screen when a step fails.
+            progress = st.empty()
+            status = progress.status("Fetching company data...")
+            fetched_data = fetch_brreg_data(st.session_state.org_nr)
+
             if isinstance(fetched_data, dict):
                 st.session_state.startup_name = fetched_data['name']
-                st.session_state.business_description = fetched_data['description_en']
                 st.session_state.website = fetched_data['website']
-                st.session_state.sector = fetched_data['sector']
                 st.session_state.employees = fetched_data['employees']
 
-                with st.spinner("🤖 Gemini AI is analyzing your business..."):
+                # The sector is translated in the same request as the description, so it adds no round-trip.
+                status.update(label=f"Found {fetched_data['name']}. Translating company data...")
+                st.session_state.business_description, st.session_state.sector = translate_batch([fetched_data['description_no'], fetched_data['sector']])
+
+                status.update(label="🤖 Gemini AI is analyzing your business...")
+                try:
                     st.session_state.mapped_sdgs = analyze_sdgs_with_ai(st.session_state.business_description)
+                    progress.empty()
+                    st.toast("Analysis complete", icon="✅")
+                except (KeyError, FileNotFoundError) as e:
+                    status.update(label="Gemini analysis failed", state="error")
+                    st.error(f"Error configuring Gemini. Is your API key in Streamlit Secrets? Details: {e}")
+                except Exception as e:
+                    status.update(label="Gemini analysis failed", state="error")
+                    st.error(f"An error occurred with the Gemini AI analysis: {e}")
 
                 st.session_state.setup_complete = True
             else:
+                status.update(label="Company lookup failed", state="error")
                 st.error(fetched_data)
         else:
             st.warning("Please enter an Organisation Number.")
 
-    st.text_input("Norwegian Organisation Number", key="org_nr")
-    st.caption("Enter the 9-digit number without any spaces or letters.")
-    st.button("Find Company & Start Analysis", on_click=start_analysis)
+    # A form so typing the number does not rerun the script; only submitting does.
+    with st.form("setup"):
+        st.text_input("Norwegian Organisation Number", key="org_nr")
+        st.caption("Enter the 9-digit number without any spaces or letters.")
+        st.form_submit_button("Find Company & Start Analysis", on_click=start_analysis)
 
 # ==============================================================================
 # MAIN APPLICATION PAGES
 # ==============================================================================
-else:
-    page = st.sidebar.radio(
-        "Choose a step:",
-        ["🏠 Home", "1. Map SDGs", "2. Prioritize SDGs", "3. Set Goals & KPIs",
-         "4. Integrate Strategy", "5. Select Framework", "6. Generate Report"]
-    )
-    
-    st.title(f"SDG Tool for: {st.session_state.startup_name}")
-    st.markdown("---")
-    
-    if page == "🏠 Home":
-        st.header("Company Profile")
-        col1, col2 = st.columns(2)
-        with col1:
-            st.metric(label="👥 Number of Employees", value=st.session_state.employees)
-        with col2:
-            st.markdown(f"**🌐 Website:** [{st.session_state.website}](http://{st.session_state.website})")
-        st.markdown(f"** sectoral Activity Sector:** {st.session_state.sector}")
-        st.subheader("Business Description (for SDG Mapping)")
-        st.info(f"*{st.session_state.business_description}*")
-
-    elif page == "1. Map SDGs":
-        st.header("1. AI-Powered SDG Mapping & Relevance Assessment")
-        
-        if not st.session_state.mapped_sdgs:
-            st.warning("The AI analysis did not find any relevant SDGs or an error occurred.")
-        else:
-            st.success(f"The AI has identified {len(st.session_state.mapped_sdgs)} relevant SDGs for your business:")
-            for code, title in st.session_state.mapped_sdgs.items():
-                st.markdown(f"- **{code}:** {title}")
-
-    elif page == "2. Prioritize SDGs":
-        st.header("2. Prioritization & Impact Analysis")
-        if not st.session_state.mapped_sdgs:
-            st.warning("Please run the analysis on the Home page first.")
-        else:
-            st.write("Based on the AI analysis, here are your most impactful SDGs:")
-            for i, (code, title) in enumerate(st.session_state.mapped_sdgs.items()):
-                 st.metric(label=f"Priority {i+1}", value=code, delta=title, delta_color="off")
-    
-    elif page == "3. Set Goals & KPIs":
-        st.header("3. Goal Setting & KPIs")
-        if not st.session_state.mapped_sdgs:
-            st.warning("No SDGs have been mapped yet.")
-        else:
-            sdg_options = list(st.session_state.mapped_sdgs.keys())
-            selected_sdg = st.selectbox("Select an SDG to set a goal for:", options=sdg_options)
+# Pages with inputs are fragments: saving a goal or plan reruns only that page, not the whole script.
+
+def home_page():
+    st.header("Company Profile")
+    col1, col2 = st.columns(2)
+    with col1:
+        st.metric(label="👥 Number of Employees", value=st.session_state.employees)
+    with col2:
+        st.markdown(f"**🌐 Website:** [{st.session_state.website}](http://{st.session_state.website})")
+    st.markdown(f"** sectoral Activity Sector:** {st.session_state.sector}")
+    st.subheader("Business Description (for SDG Mapping)")
+    st.info(f"*{st.session_state.business_description}*")
+
+def map_sdgs_page():
+    st.header("1. AI-Powered SDG Mapping & Relevance Assessment")
+
+    if not st.session_state.mapped_sdgs:
+        st.warning("The AI analysis did not find any relevant SDGs or an error occurred.")
+    else:
+        st.success(f"The AI has identified {len(st.session_state.mapped_sdgs)} relevant SDGs for your business:")
+        for code, title in st.session_state.mapped_sdgs.items():
+            st.markdown(f"- **{code}:** {title}")
+
+def prioritize_sdgs_page():
+    st.header("2. Prioritization & Impact Analysis")
+    if not st.session_state.mapped_sdgs:
+        st.warning("Please run the analysis on the Home page first.")
+    else:
+        st.write("Based on the AI analysis, here are your most impactful SDGs:")
+        for i, (code, title) in enumerate(st.session_state.mapped_sdgs.items()):
+             st.metric(label=f"Priority {i+1}", value=code, delta=title, delta_color="off")
+
+@st.fragment
+def goals_page():
+    st.header("3. Goal Setting & KPIs")
+    if not st.session_state.mapped_sdgs:
+        st.warning("No SDGs have been mapped yet.")
+    else:
+        sdg_options = list(st.session_state.mapped_sdgs.keys())
+        selected_sdg = st.selectbox("Select an SDG to set a goal for:", options=sdg_options)
+        # The selectbox stays outside the form so the input labels follow the selected SDG.
+        with st.form("goal_form"):
             goal = st.text_input(f"Enter a specific goal for {selected_sdg}:")
             kpi = st.text_area(f"Enter the KPI to measure this goal:")
-            if st.button("Save Goal"):
-                st.session_state.goals_and_kpis[selected_sdg] = {"goal": goal, "kpi": kpi}
-                st.success(f"Goal for {selected_sdg} has been saved!")
-            if st.session_state.goals_and_kpis:
-                st.write("---")
-                st.subheader("Saved Goals:")
-                for code, data in st.session_state.goals_and_kpis.items():
-                    st.markdown(f"**{code}** | **Goal:** {data['goal']} | **KPI:** {data['kpi']}")
-
-    elif page == "4. Integrate Strategy":
-        st.header("4. Integration Tools")
-        if not st.session_state.goals_and_kpis:
-            st.warning("Please set at least one goal in Step 3 first.")
-        else:
-            goal_options = list(st.session_state.goals_and_kpis.keys())
-            selected_goal = st.selectbox("Select a goal to integrate:", options=goal_options)
+            saved = st.form_submit_button("Save Goal")
+        if saved:
+            st.session_state.goals_and_kpis[selected_sdg] = {"goal": goal, "kpi": kpi}
+            st.success(f"Goal for {selected_sdg} has been saved!")
+        if st.session_state.goals_and_kpis:
+            st.write("---")
+            st.subheader("Saved Goals:")
+            st.dataframe(
+                [{"SDG": code, "Goal": data['goal'], "KPI": data['kpi']} for code, data in st.session_state.goals_and_kpis.items()],
+                hide_index=True,
+            )
+
+@st.fragment
+def integration_page():
+    st.header("4. Integration Tools")
+    if not st.session_state.goals_and_kpis:
+        st.warning("Please set at least one goal in Step 3 first.")
+    else:
+        goal_options = list(st.session_state.goals_and_kpis.keys())
+        selected_goal = st.selectbox("Select a goal to integrate:", options=goal_options)
+        with st.form("integration_form"):
             department = st.text_input("Which department is responsible? (e.g., R&D)")
             action_item = st.text_area("What is the specific action item for them?")
-            if st.button("Save Integration"):
-                st.session_state.integration_plan[selected_goal] = {"department": department, "action_item": action_item}
-                st.success(f"Integration plan for {selected_goal} has been saved!")
-            if st.session_state.integration_plan:
-                st.write("---")
-                st.subheader("Saved Integration Plans:")
-                for code, data in st.session_state.integration_plan.items():
-                    st.markdown(f"**{code} Goal -> Department: {data['department']}** | **Action:** {data['action_item']}")
-
-    elif page == "5. Select Framework":
-        st.header("5. Customizable Frameworks")
-        frameworks = ["GRI", "IRIS", "B Corp", "SDG Compass"]
-        selected_framework = st.selectbox("Select a reporting framework:", options=frameworks)
-        st.session_state.reporting_framework = selected_framework
-        st.success(f"Reporting framework set to: {st.session_state.reporting_framework}")
-
-    elif page == "6. Generate Report":
-        st.header("📄 Final SDG Impact Report")
-
-        # NEW: Add a dynamic information box based on the selected framework
-        st.subheader("5. Reporting Framework Alignment")
-        framework = st.session_state.get("reporting_framework", "Not Selected")
-        st.markdown(f"**Framework Selected:** {framework}")
-
-        if framework == "GRI":
-            st.info(
-                "**GRI Standards:** This report is aligned with the Global Reporting Initiative (GRI), "
-                "which focuses on impact-oriented reporting for a multi-stakeholder audience. "
-                "[Learn more about GRI](https://www.globalreporting.org/)"
-            )
-        elif framework == "IRIS":
-            st.info(
-                "**IRIS+ Metrics:** This report is aligned with IRIS+, which provides a catalog of generally accepted "
-                "performance metrics that leading impact investors use to measure social, environmental, and financial success. "
-                "[Learn more about IRIS+](https://iris.thegiin.org/)"
-            )
-        elif framework == "B Corp":
-            st.info(
-                "**B Corp Framework:** This report is aligned with the B Corp framework, which measures a company’s "
-                "entire social and environmental performance, from supply chain to charitable giving. "
-                "[Learn more about B Corp](https://www.bcorporation.net/)"
-            )
-        elif framework == "SDG Compass":
-            st.info(
-                "**SDG Compass:** This report is aligned with the SDG Compass, which provides guidance for companies on how they "
-                "can align their strategies as well as measure and manage their contribution to the SDGs. "
-                "[Learn more about the SDG Compass](https://sdgcompass.org/)"
+            saved = st.form_submit_button("Save Integration")
+        if saved:
+            st.session_state.integration_plan[selected_goal] = {"department": department, "action_item": action_item}
+            st.success(f"Integration plan for {selected_goal} has been saved!")
+        if st.session_state.integration_plan:
+            st.write("---")
+            st.subheader("Saved Integration Plans:")
+            st.dataframe(
+                [{"Goal": code, "Department": data['department'], "Action": data['action_item']} for code, data in st.session_state.integration_plan.items()],
+                hide_index=True,
             )
-        
-        st.markdown("---") # Visual separator
 
-        st.subheader("1. Relevant SDGs")
-        if st.session_state.mapped_sdgs:
-            for code, title in st.session_state.mapped_sdgs.items(): st.markdown(f"- **{code}:** {title}")
-        else: st.info("Not yet defined.")
+@st.fragment
+def framework_page():
+    st.header("5. Customizable Frameworks")
+    frameworks = ["GRI", "IRIS", "B Corp", "SDG Compass"]
+    selected_framework = st.selectbox("Select a reporting framework:", options=frameworks)
+    st.session_state.reporting_framework = selected_framework
+    st.success(f"Reporting framework set to: {st.session_state.reporting_framework}")
 
-        st.subheader("2. Prioritized Impact Areas")
-        if st.session_state.mapped_sdgs:
-            for code, title in st.session_state.mapped_sdgs.items(): st.markdown(f"- **{code}:** {title}")
-        else: st.info("Not yet defined.")
+def report_page():
+    st.header("📄 Final SDG Impact Report")
 
-        st.subheader("3. Goals and KPIs")
-        if st.session_state.goals_and_kpis:
-            for code, data in st.session_state.goals_and_kpis.items():
-                st.markdown(f"**{code}**")
-                st.markdown(f"  - **Goal:** {data['goal']}")
-                st.markdown(f"  - **KPI:** {data['kpi']}")
-        else: st.info("Not yet defined.")
+    # NEW: Add a dynamic information box based on the selected framework
+    st.subheader("5. Reporting Framework Alignment")
+    framework = st.session_state.get("reporting_framework", "Not Selected")
+    st.markdown(f"**Framework Selected:** {framework}")
 
-        st.subheader("4. Strategy Integration")
-        if st.session_state.integration_plan:
-            for code, data in st.session_state.integration_plan.items():
-                st.markdown(f"**{data['department']} Department**")
-                st.markdown(f"  - **Action for {code}:** {data['action_item']}")
-        else: st.info("Not yet defined.")
+    if framework == "GRI":
+        st.info(
+            "**GRI Standards:** This report is aligned with the Global Reporting Initiative (GRI), "
+            "which focuses on impact-oriented reporting for a multi-stakeholder audience. "
+            "[Learn more about GRI](https://www.globalreporting.org/)"
+        )
+    elif framework == "IRIS":
+        st.info(
+            "**IRIS+ Metrics:** This report is aligned with IRIS+, which provides a catalog of generally accepted "
+            "performance metrics that leading impact investors use to measure social, environmental, and financial success. "
+            "[Learn more about IRIS+](https://iris.thegiin.org/)"
+        )
+    elif framework == "B Corp":
+        st.info(
+            "**B Corp Framework:** This report is aligned with the B Corp framework, which measures a company’s "
+            "entire social and environmental performance, from supply chain to charitable giving. "
+            "[Learn more about B Corp](https://www.bcorporation.net/)"
+        )
+    elif framework == "SDG Compass":
+        st.info(
+            "**SDG Compass:** This report is aligned with the SDG Compass, which provides guidance for companies on how they "
+            "can align their strategies as well as measure and manage their contribution to the SDGs. "
+            "[Learn more about the SDG Compass](https://sdgcompass.org/)"
+        )
+
+    st.markdown("---") # Visual separator
+
+    # Each section is emitted as one markdown element rather than one element per line item.
+    sdg_list = "\n".join(f"- **{code}:** {title}" for code, title in st.session_state.mapped_sdgs.items())
+
+    st.subheader("1. Relevant SDGs")
+    if sdg_list: st.markdown(sdg_list)
+    else: st.info("Not yet defined.")
+
+    st.subheader("2. Prioritized Impact Areas")
+    if sdg_list: st.markdown(sdg_list)
+    else: st.info("Not yet defined.")
+
+    st.subheader("3. Goals and KPIs")
+    if st.session_state.goals_and_kpis:
+        st.markdown("\n\n".join(
+            f"**{code}**\n  - **Goal:** {data['goal']}\n  - **KPI:** {data['kpi']}"
+            for code, data in st.session_state.goals_and_kpis.items()
+        ))
+    else: st.info("Not yet defined.")
+
+    st.subheader("4. Strategy Integration")
+    if st.session_state.integration_plan:
+        st.markdown("\n\n".join(
+            f"**{data['department']} Department**\n  - **Action for {code}:** {data['action_item']}"
+            for code, data in st.session_state.integration_plan.items()
+        ))
+    else: st.info("Not yet defined.")
+
+# (title, url_path, page function); explicit url_paths keep bookmarked URLs stable.
+MAIN_PAGES = [
+    ("🏠 Home", "home", home_page),
+    ("1. Map SDGs", "map", map_sdgs_page),
+    ("2. Prioritize SDGs", "prioritize", prioritize_sdgs_page),
+    ("3. Set Goals & KPIs", "goals", goals_page),
+    ("4. Integrate Strategy", "integrate", integration_page),
+    ("5. Select Framework", "framework", framework_page),
+    ("6. Generate Report", "report", report_page),
+]
+
+# ==============================================================================
+# PAGE DISPATCH
+# ==============================================================================
+# st.navigation only executes the selected page's function on each rerun. The main
+# pages are always registered, so a refresh or bookmark never hits "Page not found".
+setup_done = st.session_state.setup_complete
+main_pages = [st.Page(render, title=title, url_path=url_path, default=setup_done and render is home_page)
+              for title, url_path, render in MAIN_PAGES]
+
+if not setup_done:
+    setup = st.Page(setup_page, title="Setup", url_path="setup", default=True)
+    navigation = st.navigation([setup] + main_pages, position="hidden")
+    # A main page opened before setup (e.g. a bookmark) is sent to setup first.
+    if navigation.url_path != setup.url_path:
+        st.switch_page(setup)
+else:
+    navigation = st.navigation({"🚀 SDG Tool Navigation": main_pages})
+    
+    st.title(f"SDG Tool for: {st.session_state.startup_name}")
+    st.markdown("---")
+    
+navigation.run()